@@ -1,15 +1,15 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
+from laplace_solver import relax_normal
+from superposition import solve_superposition
 
 # Function to relax the grid
 def relax(grid, grid_new, n):
     """
     Perform one step of relaxation using the Jacobi method.
     """
-    for i in range(1, n + 1):
-        for j in range(1, n + 1):
-            grid_new[i, j] = 0.25 * (grid[i + 1, j] + grid[i - 1, j] + grid[i, j + 1] + grid[i, j - 1])
+    relax_normal(grid, grid_new, n)
 
 # Function to initialize the grid with custom boundary conditions
 def initialize_grid_with_custom_boundary(n, left=5, top=10, right=5, bottom=10, center_value=0):
@@ -35,10 +35,21 @@ def calculate_error(grid, grid_new):
     return np.max(np.abs(grid_new[1:-1, 1:-1] - grid[1:-1, 1:-1]))
 
 # Function to animate relaxation
-def animate_relaxation(n, left=5, top=10, right=5, bottom=10, tolerance=0.01, nsteps=1000):
+def animate_relaxation(n, left=5, top=10, right=5, bottom=10, tolerance=0.01, nsteps=1000, solver="jacobi"):
     """
     Perform Jacobi relaxation on the grid and animate the process.
+    With solver="superposition" the converged grid is shown straight away,
+    built from the cached unit-side solutions for this grid size.
     """
+    if solver == "superposition":
+        v = solve_superposition(n, left, top, right, bottom)
+        fig, ax = plt.subplots()
+        im = ax.imshow(v, cmap='hot', interpolation='nearest', origin='lower')
+        plt.colorbar(im, ax=ax, label="Potential")
+        ax.set_title(f"Superposition Solution\nBoundary: Left={left}, Top={top}, Right={right}, Bottom={bottom}")
+        plt.show()
+        return
+
     # Initialize grid and new grid
     v, vnew = initialize_grid_with_custom_boundary(n, left, top, right, bottom)
     
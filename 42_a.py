@@ -1,122 +1,60 @@
+import os
+
 import numpy as np
 import matplotlib.pyplot as plt
-
-# Function to relax the grid using Jacobi method (normal updates)
-def relax_normal(grid, grid_new, n):
-    for i in range(1, n + 1):
-        for j in range(1, n + 1):
-            grid_new[i, j] = 0.25 * (grid[i + 1, j] + grid[i - 1, j] + grid[i, j + 1] + grid[i, j - 1])
-# Function to relax the grid using Gauss-Seidel method (sequential updates)
-def relax_gauss_seidel(v, n):
-    """
-    Update the potential grid using the Gauss-Seidel method.
-    Updates are applied sequentially, immediately using the most recent values.
-    """
-    for i in range(1, n + 1):
-        for j in range(1, n + 1):
-            v[i, j] = 0.25 * (v[i + 1, j] + v[i - 1, j] + v[i, j + 1] + v[i, j - 1])
-    
-def calculate_error_gauss_seidel(v, n):
-    """
-    Compute the maximum error based on the difference between old and new values.
-    """
-    max_error = 0
-    for i in range(1, n + 1):
-        for j in range(1, n + 1):
-            updated_value = 0.25 * (v[i + 1, j] + v[i - 1, j] + v[i, j + 1] + v[i, j - 1])
-            error = abs(updated_value - v[i, j])
-            #print(error)
-            max_error = max(max_error, error)
-    return max_error
-
-def calculate_error(v,new_v):
-    return np.max(np.abs(new_v[1:-1, 1:-1] - v[1:-1, 1:-1]))
-# Function to initialize the grid with custom boundary conditions
-def initialize_grid_with_custom_boundary(n, left=5, top=10, right=5, bottom=10, center_value=0):
-    v = np.zeros((n + 2, n + 2))  # Include boundary points
-    v[:, 0] = left   # Left boundary
-    v[0, :] = top    # Top boundary
-    v[:, -1] = right # Right boundary
-    v[-1, :] = bottom # Bottom boundary
-
-    v[1:-1, 1:-1] = 7.5
-
-
-    return v
-
-
-# Function to run the relaxation for both Jacobi and Gauss-Seidel methods
-def run_relaxation_gauss(v, grid_size, left=10, top=10, right=10, bottom=0, tolerance=1e-3, nsteps=10000):
-    n = grid_size
-    
-    #v_new = v.copy()  # For Jacobi method
-
-    #prev_grid = v.copy()  # To calculate error and detect convergence
-    iterations = 0
-    while True:
-        """prev_grid[:] = v
-        if method == relax_normal:  # Jacobi method
-            relax_normal(v, v_new, n)
-            error = calculate_error(v_new, v)
-            v[1:-1, 1:-1] = v_new[1:-1, 1:-1]
-            
-
-        elif method == relax_gauss_seidel:  # Gauss-Seidel method"""
-        max_error = calculate_error_gauss_seidel(v, n)
-        #print(max_error)
-        if max_error < tolerance:
-            break
-        relax_gauss_seidel(v, n)
-        iterations += 1
-
-    print("ok")
-    return iterations,v
-def run_relaxation_normal(v, grid_size, left=10, top=10, right=10, bottom=0, tolerance=1e-3, nsteps=10000):
-    n = grid_size
-    
-    v_new = v.copy()  # For Jacobi method
-
-    #prev_grid = v.copy()  # To calculate error and detect convergence
-    iterations = 0
-    while True:
-        relax_normal(v, v_new, n)
-        error = calculate_error(v_new, v)
-        v[1:-1, 1:-1] = v_new[1:-1, 1:-1]
-            
-
-
-        if error < tolerance:
-            break
-        iterations += 1
-
-    print("ok")
-    return iterations,v
+from sweep import run_sweep
 
 if __name__ == "__main__":
     grid_sizes = list(range(10, 300, 20))
-    jacobi_iterations = []
-    gauss_seidel_iterations = []
+    boundaries = (10, 10, 10, 0)  # Left, top, right, bottom
+
+    # Solve every (method, grid size) pair on a process pool; finished jobs are kept in sweep_cache/
+    jobs = [(method, grid_size, boundaries, 0.01) for grid_size in grid_sizes
+            for method in ("jacobi", "gauss_seidel", "multigrid", "chebyshev")]
+    jobs += [("exact", grid_size, boundaries, 0) for grid_size in grid_sizes]
+    results = run_sweep(jobs, workers=os.cpu_count())
+
+    # The same sweep with every size warm-started from the previous one; counted and plotted separately
+    warm_jobs = [(method, grid_size, boundaries, 0.01) for grid_size in grid_sizes
+                 for method in ("jacobi", "gauss_seidel")]
+    warm_results = run_sweep(warm_jobs, workers=os.cpu_count(), warm_start=True)
+    jacobi_warm_iterations = [warm_results[("jacobi", grid_size, boundaries, 0.01)]["iterations"]
+                              for grid_size in grid_sizes]
+    gauss_seidel_warm_iterations = [warm_results[("gauss_seidel", grid_size, boundaries, 0.01)]["iterations"]
+                                    for grid_size in grid_sizes]
+
+    def result(method, grid_size, key, tolerance=0.01):
+        return results[(method, grid_size, boundaries, tolerance)][key]
+
+    jacobi_iterations = [result("jacobi", grid_size, "iterations") for grid_size in grid_sizes]
+    gauss_seidel_iterations = [result("gauss_seidel", grid_size, "iterations") for grid_size in grid_sizes]
+    multigrid_iterations = [result("multigrid", grid_size, "iterations") for grid_size in grid_sizes]
+    chebyshev_iterations = [result("chebyshev", grid_size, "iterations") for grid_size in grid_sizes]
     max_differences = []
-    # Collect iterations for Jacobi method
+    jacobi_exact_differences = []
+    gauss_seidel_exact_differences = []
     for grid_size in grid_sizes:
-        v = initialize_grid_with_custom_boundary(grid_size, left = 10, top = 10, right = 10, bottom = 0)
-        iterations,final_v_normal = run_relaxation_normal(v, grid_size, tolerance=0.01)
-        jacobi_iterations.append(iterations)
-        v = initialize_grid_with_custom_boundary(grid_size, left = 10, top = 10, right = 10, bottom = 0)
-
-    # Collect iterations for Gauss-Seidel method
-        iterations,final_v_gauss = run_relaxation_gauss(v, grid_size, tolerance=0.01)
-        gauss_seidel_iterations.append(iterations)
+        final_v_normal = result("jacobi", grid_size, "grid")
+        final_v_gauss = result("gauss_seidel", grid_size, "grid")
+        exact_v = result("exact", grid_size, "grid", 0)
 
         # Compute the maximum difference between the two grids
-        max_difference = np.max(np.abs(final_v_normal - final_v_gauss))
-        max_differences.append(max_difference)
+        max_differences.append(np.max(np.abs(final_v_normal - final_v_gauss)))
+
+        # Compare both methods with the exact solution of the discrete problem
+        jacobi_exact_differences.append(np.max(np.abs(final_v_normal - exact_v)))
+        gauss_seidel_exact_differences.append(np.max(np.abs(final_v_gauss - exact_v)))
 
 
     # Plot the results
     plt.figure(1)
     plt.plot(grid_sizes, jacobi_iterations, label="Default Method", marker='o')
     plt.plot(grid_sizes, gauss_seidel_iterations, label="Gauss-Seidel Method", marker='s')
+    plt.plot(grid_sizes, multigrid_iterations, label="Multigrid V-cycles", marker='d')
+    plt.plot(grid_sizes, chebyshev_iterations, label="Chebyshev-accelerated Jacobi", marker='*')
+    plt.plot(grid_sizes, jacobi_warm_iterations, label="Default Method (warm start)", marker='o', linestyle='--')
+    plt.plot(grid_sizes, gauss_seidel_warm_iterations, label="Gauss-Seidel Method (warm start)", marker='s',
+             linestyle='--')
     plt.title("Iterations vs Grid Size")
     plt.xlabel("Grid Size (n)")
     plt.ylabel("Iterations to Converge")
@@ -128,8 +66,10 @@ if __name__ == "__main__":
     plt.title("Maximum Differences Between Final Grids")
 
     plt.xlabel("Grid Size (n)")
-    plt.ylabel("Difference between Gauss and normal methods")
+    plt.ylabel("Maximum difference")
     plt.plot(grid_sizes,max_differences, label = "max(abs(difference of the grid of the two methods))",marker = "o")
+    plt.plot(grid_sizes,jacobi_exact_differences, label = "max(abs(normal - exact))",marker = "s")
+    plt.plot(grid_sizes,gauss_seidel_exact_differences, label = "max(abs(Gauss-Seidel - exact))",marker = "^")
     plt.legend()
     plt.grid(True)
     plt.show()
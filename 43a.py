@@ -1,23 +1,20 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from random_walks import sample_boundary_values, path_reuse_estimate
+from parallel_walks import parallel_boundary_values
+from adaptive_walks import adaptive_random_walks
+from variance_reduction import VARIANCE_REDUCTIONS, coarse_control, reduced_variance_estimate
 
-def random_walk(grid, x0, y0):
-    x, y = x0, y0
-    n, m = grid.shape
-    while 0 < x < n - 1 and 0 < y < m - 1:  # Stay within the interior of the grid
-        step = np.random.choice(["up", "down", "left", "right"])
-        if step == "up":
-            x -= 1
-        elif step == "down":
-            x += 1
-        elif step == "left":
-            y -= 1
-        elif step == "right":
-            y += 1
-    return grid[x, y]
-
-def estimate_potential(grid, start_x, start_y, num_walks):
-    boundary_values = [random_walk(grid, start_x, start_y) for _ in range(num_walks)]
+def estimate_potential(grid, start_x, start_y, num_walks, method="lattice", variance_reduction=None, control=None):
+    if variance_reduction is not None:
+        if method != "lattice":
+            raise ValueError("variance_reduction needs method='lattice', its walks step on the lattice")
+        antithetic = variance_reduction in ("antithetic", "both")
+        control = control if variance_reduction in ("control", "both") else None
+        mean, _, _ = reduced_variance_estimate(grid, start_x, start_y, num_walks, antithetic=antithetic,
+                                               control=control)
+        return mean
+    boundary_values = sample_boundary_values(grid, start_x, start_y, num_walks, method=method)
     return np.mean(boundary_values)
 
 # Function to initialize the grid with custom boundary conditions
@@ -29,25 +26,52 @@ def initialize_grid_with_custom_boundary(n, left=5, top=10, right=5, bottom=10,
     v[-1, :] = bottom # Bottom boundary
     return v
 
-def run_random_walks(n, num_walks):
+def run_random_walks(n, num_walks, seed=None, workers=None, variance_reduction=None):
+    if variance_reduction not in VARIANCE_REDUCTIONS:
+        raise ValueError(f"variance_reduction must be one of {VARIANCE_REDUCTIONS}, got {variance_reduction!r}")
+    if workers is not None and variance_reduction is not None:
+        raise ValueError("variance_reduction is only available for serial runs")
     # Initialize grid with boundary conditions
     grid = initialize_grid_with_custom_boundary(n)
     n, m = grid.shape
     potential = grid.copy()  # Start with the boundary conditions in the potential grid
 
+    # Parallel mode: all cells on a process pool, reproducible for a given seed
+    if workers is not None:
+        i, j = np.mgrid[1:n - 1, 1:m - 1]
+        boundary_values = parallel_boundary_values(grid, i.ravel(), j.ravel(), num_walks, seed, workers)
+        potential[1:-1, 1:-1] = boundary_values.mean(axis=1).reshape(n - 2, m - 2)
+        return potential
+
     # Calculate potential for interior points using random walks
+    control = coarse_control(grid) if variance_reduction in ("control", "both") else None
     for i in range(1, n - 1):
         for j in range(1, m - 1):
-            potential[i, j] = estimate_potential(grid, i, j, num_walks)
+            potential[i, j] = estimate_potential(grid, i, j, num_walks, variance_reduction=variance_reduction,
+                                                 control=control)
 
     return potential
 
+# Estimate the whole potential grid from one shared budget of num_walks walks
+def run_random_walks_path_reuse(n, num_walks):
+    grid = initialize_grid_with_custom_boundary(n)
+    potential, sample_counts = path_reuse_estimate(grid, num_walks)
+    return potential, sample_counts
+
+# Spend walks where the variance is, until the grid-wide standard error reaches target_error
+def run_random_walks_adaptive(n, target_error, pilot_walks=100):
+    grid = initialize_grid_with_custom_boundary(n)
+    potential, walks, standard_error = adaptive_random_walks(grid, target_error, pilot_walks)
+    return potential, walks, standard_error
+
 if __name__ == "__main__":
     n = 10
 
     # Perform random walks to estimate potential
     potential100 = run_random_walks(n, 100)
     potential1000 = run_random_walks(n, 1000)
+    potential_reuse, sample_counts = run_random_walks_path_reuse(n, 1000)
+    potential_adaptive, walk_counts, _ = run_random_walks_adaptive(n, 0.05)
 
     # Plot the results for 100 walks
     plt.figure(1)
@@ -63,4 +87,30 @@ if __name__ == "__main__":
     plt.colorbar(label="Potential")
     plt.grid(False)
 
+    # Plot the results for 1000 shared walks with path reuse
+    plt.figure(3)
+    plt.title("1000 Walks in Total (Path Reuse)")
+    plt.imshow(potential_reuse, origin='upper', cmap='viridis')
+    plt.colorbar(label="Potential")
+    plt.grid(False)
+
+    plt.figure(4)
+    plt.title("Samples per Cell (Path Reuse)")
+    plt.imshow(sample_counts, origin='upper', cmap='viridis')
+    plt.colorbar(label="Samples")
+    plt.grid(False)
+
+    # Plot the results for the variance-adaptive allocation
+    plt.figure(5)
+    plt.title("Adaptive Walks (Standard Error 0.05)")
+    plt.imshow(potential_adaptive, origin='upper', cmap='viridis')
+    plt.colorbar(label="Potential")
+    plt.grid(False)
+
+    plt.figure(6)
+    plt.title("Walks per Cell (Adaptive)")
+    plt.imshow(walk_counts, origin='upper', cmap='viridis')
+    plt.colorbar(label="Walks")
+    plt.grid(False)
+
     plt.show()
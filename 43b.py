@@ -1,23 +1,21 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from random_walks import sample_boundary_values
+from parallel_walks import parallel_boundary_values
+from running_statistics import streaming_estimate
+from variance_reduction import VARIANCE_REDUCTIONS, coarse_control, reduced_variance_estimate
 
-def random_walk(grid, x0, y0):
-    x, y = x0, y0
-    n, m = grid.shape
-    while 0 < x < n - 1 and 0 < y < m - 1:  # Stay within the interior of the grid
-        step = np.random.choice(["up", "down", "left", "right"])
-        if step == "up":
-            x -= 1
-        elif step == "down":
-            x += 1
-        elif step == "left":
-            y -= 1
-        elif step == "right":
-            y += 1
-    return grid[x, y]
-
-def estimate_potential_and_variance(grid, start_x, start_y, num_walks):
-    boundary_values = [random_walk(grid, start_x, start_y) for _ in range(num_walks)]
+# With variance_reduction set ("antithetic", "control" or "both") the variance reduction factor is returned too
+def estimate_potential_and_variance(grid, start_x, start_y, num_walks, method="lattice", variance_reduction=None,
+                                    control=None):
+    if variance_reduction is not None:
+        if method != "lattice":
+            raise ValueError("variance_reduction needs method='lattice', its walks step on the lattice")
+        antithetic = variance_reduction in ("antithetic", "both")
+        control = control if variance_reduction in ("control", "both") else None
+        # Which mirror anti-correlates depends on the point, so reduced_variance_estimate picks it per point
+        return reduced_variance_estimate(grid, start_x, start_y, num_walks, antithetic=antithetic, control=control)
+    boundary_values = sample_boundary_values(grid, start_x, start_y, num_walks, method=method)
     mean_potential = np.mean(boundary_values)
     variance = np.var(boundary_values)
     return mean_potential, variance
@@ -31,14 +29,53 @@ def initialize_grid_with_custom_boundary(n, left=5, top=10, right=5, bottom=10,
     return v
 
 # Analyze convergence for various points
-def analyze_convergence_with_variance(n, points, walkers_list):
+def analyze_convergence_with_variance(n, points, walkers_list, method="lattice", seed=None, workers=None,
+                                      streaming=False, variance_reduction=None):
+    if variance_reduction not in VARIANCE_REDUCTIONS:
+        raise ValueError(f"variance_reduction must be one of {VARIANCE_REDUCTIONS}, got {variance_reduction!r}")
     grid = initialize_grid_with_custom_boundary(n)
     results = {point: {"potentials": [], "variances": []} for point in points}
     
+    # Streaming mode: one growing sample per point, checkpointed at every entry of walkers_list
+    if streaming:
+        if workers is not None or variance_reduction is not None:
+            raise ValueError("streaming is only available for serial runs without variance_reduction")
+        for point, seed_sequence in zip(points, np.random.SeedSequence(seed).spawn(len(points))):
+            x, y = point
+            stream = streaming_estimate(grid, x, y, walkers_list, rng=seed_sequence, method=method)
+            results[point]["potentials"] = stream["potentials"]
+            results[point]["variances"] = stream["variances"]
+        return results
+
+    # Parallel mode: every point and walk batch on a process pool, reproducible for a given seed
+    if workers is not None:
+        x, y = np.array(points).T
+        for num_walkers, seed_sequence in zip(walkers_list, np.random.SeedSequence(seed).spawn(len(walkers_list))):
+            boundary_values = parallel_boundary_values(grid, x, y, num_walkers, seed_sequence, workers, method=method)
+            for point, values in zip(points, boundary_values):
+                results[point]["potentials"].append(np.mean(values))
+                results[point]["variances"].append(np.var(values))
+        return results
+
+    # Variance-reduced mode: one coarse Gauss-Seidel control shared by all points
+    if variance_reduction is not None:
+        control = coarse_control(grid) if variance_reduction in ("control", "both") else None
+        for point in points:
+            results[point]["reduction_factors"] = []
+        for num_walkers in walkers_list:
+            for point in points:
+                x, y = point
+                potential, variance, factor = estimate_potential_and_variance(grid, x, y, num_walkers, method,
+                                                                              variance_reduction, control)
+                results[point]["potentials"].append(potential)
+                results[point]["variances"].append(variance)
+                results[point]["reduction_factors"].append(factor)
+        return results
+
     for num_walkers in walkers_list:
         for point in points:
             x, y = point
-            potential, variance = estimate_potential_and_variance(grid, x, y, num_walkers)
+            potential, variance = estimate_potential_and_variance(grid, x, y, num_walkers, method)
             results[point]["potentials"].append(potential)
             results[point]["variances"].append(variance)
     
@@ -66,6 +103,17 @@ def plot_variance_convergence(points, walkers_list, results):
     plt.yscale("log")  # Use a logarithmic scale for better visualization
     plt.legend()
     plt.grid(True)
+
+    if "reduction_factors" in results[points[0]]:
+        plt.figure(3)
+        for point in points:
+            plt.plot(walkers_list, results[point]["reduction_factors"], label=f"Point {point}")
+        plt.title("Variance Reduction Factor vs Number of Walkers")
+        plt.xlabel("Number of Walkers")
+        plt.ylabel("Variance Reduction Factor")
+        plt.yscale("log")
+        plt.legend()
+        plt.grid(True)
     plt.show()
 
 if __name__ == "__main__":
@@ -1,25 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
-
-# Random walk function as before
-def random_walk(grid, x0, y0):
-    x, y = x0, y0
-    n, m = grid.shape
-    while 0 < x < n - 1 and 0 < y < m - 1:  # Stay within the interior of the grid
-        step = np.random.choice(["up", "down", "left", "right"])
-        if step == "up":
-            x -= 1
-        elif step == "down":
-            x += 1
-        elif step == "left":
-            y -= 1
-        elif step == "right":
-            y += 1
-    return grid[x, y]
+from random_walks import sample_boundary_values
+from running_statistics import streaming_estimate
 
 # Modified to return boundary values for variance analysis
 def estimate_potential_and_variance(grid, start_x, start_y, num_walks):
-    boundary_values = [random_walk(grid, start_x, start_y) for _ in range(num_walks)]
+    boundary_values = sample_boundary_values(grid, start_x, start_y, num_walks)
     return np.mean(boundary_values), np.var(boundary_values)
 
 def initialize_grid_with_custom_boundary(n, left=5, top=10, right=5, bottom=10, center_value=7.5):
@@ -30,12 +16,17 @@ def initialize_grid_with_custom_boundary(n, left=5, top=10, right=5, bottom=10,
     v[-1, :] = bottom # Bottom boundary
     return v
 
-def convergence_analysis(grid, start_x, start_y, walk_counts):
+def convergence_analysis(grid, start_x, start_y, walk_counts, streaming=False):
     means, variances = [], []
     mse = []
     prev_pot = 0
-    for num_walks in walk_counts:
-        mean, var = estimate_potential_and_variance(grid, start_x, start_y, num_walks)
+    # Streaming mode extends one sample through all walk counts instead of redrawing
+    if streaming:
+        stream = streaming_estimate(grid, start_x, start_y, walk_counts)
+        estimates = zip(stream["potentials"], stream["variances"])
+    else:
+        estimates = (estimate_potential_and_variance(grid, start_x, start_y, num_walks) for num_walks in walk_counts)
+    for mean, var in estimates:
         means.append(mean)
         variances.append(var)
         mse.append(np.mean((mean-prev_pot))**2)
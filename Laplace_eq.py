@@ -1,39 +1,24 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import animation
+from laplace_solver import run_jacobi
 
 
 
 # checker=1: no checkboard, checker=2: checkerboard (note: n should be even)
 checker = 1
 
-# perform one step of relaxation
-def relax(n, v, vnew):
-    for i in range(1, n + 1):
-        for j in range(1, n + 1):
-            vnew[i, j] = 0.25 * (v[i + 1, j] + v[i - 1, j] + v[i, j + 1] + v[i, j - 1])
-
-def calc_error(v,new_v):
-    return np.max(np.abs(new_v[1:-1, 1:-1] - v[1:-1, 1:-1]))
-
 def excersice_42a():
-    global vnew
-    itterations = 0
     tolerance = 0.01
-    error = tolerance+1 #just something
-    while error > tolerance:
-        #print(itterations)
-        relax(n,v,vnew)
-        error=calc_error(v,vnew)
-        v[1:-1, 1:-1] = vnew[1:-1, 1:-1]
-        itterations+=1
+    # Ping-pong Jacobi sweeps on v; run_jacobi does not count the converged sweep, this loop always did
+    itterations, _ = run_jacobi(v, n, tolerance, nsteps=10 ** 6)
+    itterations += 1
 
     print(f"itterations for size n = {n}: {itterations}")
 
-#Create the given matrix and a zero matrix of same size
+#Create the given matrix
 n = 9
 v = np.ones((n+2, n+2))*9 #set entire matrix to 9
-vnew = np.zeros((n+2, n+2))
 L = 10
 
 # Set the boundary conditions
@@ -47,7 +32,6 @@ excersice_42a()
 #dubble gridsize
 n = 18
 v = np.ones((n+2, n+2))*9 #set entire matrix to 9
-vnew = np.zeros((n+2, n+2))
 L = 10
 
 # Set the boundary conditions
@@ -0,0 +1,63 @@
+import numpy as np
+from random_walks import walk_on_squares, walk_to_boundary, step_source
+
+# Function to allocate walks across the interior so the grid-wide error meets a target at least cost
+def adaptive_random_walks(grid, target_error, pilot_walks=100, max_rounds=50, rng=None, method="lattice"):
+    """
+    Run pilot_walks walks from every interior cell, then estimate each
+    cell's variance s_i^2 and mean walk length c_i. The cheapest allocation
+    with a root-mean-square standard error of target_error over the grid
+    gives cell i about s_i / sqrt(c_i) * sum_j(s_j sqrt(c_j)) / (M target^2)
+    walks, M being the number of cells. Cells are topped up towards that
+    allocation in rounds (at most doubling per round, so the estimates are
+    refreshed) until the target is met or max_rounds is reached.
+    Returns the potential grid and per-cell walk counts and standard errors.
+    """
+    n, m = grid.shape
+    source = step_source(rng)
+    walk = walk_on_squares if method == "squares" else walk_to_boundary
+    cell_x, cell_y = (index.ravel() for index in np.mgrid[1:n - 1, 1:m - 1])
+    cells = cell_x.size
+    count = np.zeros(cells, dtype=np.int64)
+    mean = np.zeros(cells)
+    m2 = np.zeros(cells)
+    steps = np.zeros(cells)
+
+    def run(allocation):
+        nonlocal mean, m2
+        start = np.repeat(np.arange(cells), allocation)
+        exit_x, exit_y, walk_steps = walk(grid.shape, cell_x[start], cell_y[start], start.size, source)
+        values = grid[exit_x, exit_y]
+        # Merge the per-cell batch statistics into the running ones (pairwise Welford update)
+        batch_count = np.bincount(start, minlength=cells)
+        has_batch = batch_count > 0
+        batch_mean = np.bincount(start, weights=values, minlength=cells) / np.maximum(batch_count, 1)
+        batch_m2 = np.bincount(start, weights=(values - batch_mean[start]) ** 2, minlength=cells)
+        total = count + batch_count
+        delta = batch_mean - mean
+        mean = np.where(has_batch, mean + delta * batch_count / np.maximum(total, 1), mean)
+        m2 = m2 + batch_m2 + np.where(has_batch, delta ** 2 * count * batch_count / np.maximum(total, 1), 0)
+        count[:] = total
+        steps[:] += np.bincount(start, weights=walk_steps, minlength=cells)
+
+    run(np.full(cells, pilot_walks))
+    for _ in range(max_rounds):
+        variance = m2 / np.maximum(count - 1, 1)
+        if np.sqrt(np.mean(variance / count)) <= target_error:
+            break
+        # Keep a small floor so a cell whose pilot happened to see one exit value is not starved
+        sigma = np.sqrt(np.maximum(variance, 0.01 * np.mean(variance)))
+        cost = np.maximum(steps / count, 1)
+        desired = sigma / np.sqrt(cost) * np.sum(sigma * np.sqrt(cost)) / (cells * target_error ** 2)
+        top_up = np.minimum(np.ceil(desired - count), count).clip(0).astype(np.int64)
+        if not top_up.any():
+            break
+        run(top_up)
+
+    potential = np.array(grid, dtype=float)
+    potential[1:-1, 1:-1] = mean.reshape(n - 2, m - 2)
+    standard_error = np.zeros(grid.shape)
+    standard_error[1:-1, 1:-1] = np.sqrt(m2 / np.maximum(count - 1, 1) / count).reshape(n - 2, m - 2)
+    walks = np.zeros(grid.shape, dtype=np.int64)
+    walks[1:-1, 1:-1] = count.reshape(n - 2, m - 2)
+    return potential, walks, standard_error
@@ -0,0 +1,73 @@
+import numpy as np
+from laplace_solver import relax_gauss_seidel
+from multigrid import residual
+
+PRECONDITIONERS = (None, "jacobi", "ssor")
+
+# Function to apply the 5-point Laplacian to a padded grid with zero boundary
+def apply_laplacian(p, n):
+    """
+    Return 4 p - (sum of neighbours) on the interior. The operator is
+    applied matrix-free on the same padded layout the relax functions use.
+    """
+    return 4 * p[1:n + 1, 1:n + 1] - (p[2:n + 2, 1:n + 1] + p[0:n, 1:n + 1] + p[1:n + 1, 2:n + 2] + p[1:n + 1, 0:n])
+
+# Function to apply the symmetric Gauss-Seidel (SSOR, omega = 1) preconditioner
+def precondition_ssor(r, n):
+    """
+    One forward and one backward Gauss-Seidel sweep on A z = r starting from
+    z = 0. The backward sweep reuses relax_gauss_seidel on the grid flipped
+    along both axes, which reverses the update order.
+    """
+    rhs = np.zeros((n + 2, n + 2))
+    rhs[1:n + 1, 1:n + 1] = r
+    z = np.zeros((n + 2, n + 2))
+    relax_gauss_seidel(z, n, rhs)
+    z_flipped = np.ascontiguousarray(z[::-1, ::-1])
+    relax_gauss_seidel(z_flipped, n, np.ascontiguousarray(rhs[::-1, ::-1]))
+    return z_flipped[n:0:-1, n:0:-1]
+
+# Function to apply the chosen preconditioner
+def precondition(r, n, preconditioner):
+    if preconditioner is None:
+        return r
+    if preconditioner == "jacobi":
+        return r / 4
+    return precondition_ssor(r, n)
+
+# Function to run the preconditioned conjugate gradient method until the grid has converged
+def run_relaxation_cg(v, grid_size, left=10, top=10, right=10, bottom=0, tolerance=1e-3, nsteps=10000,
+                      preconditioner=None, rhs=None):
+    """
+    Solve the 5-point equations for the boundary stored in v with conjugate
+    gradients. The convergence test is the same as run_relaxation_gauss
+    (max |0.25 * (sum of neighbours) - v| < tolerance). The Laplacian has a
+    constant diagonal, so the "jacobi" preconditioner only rescales and
+    does not change the iteration count; "ssor" roughly halves it.
+    Returns the number of iterations, the final grid and the residual
+    after every iteration.
+    """
+    if preconditioner not in PRECONDITIONERS:
+        raise ValueError(f"preconditioner must be one of {PRECONDITIONERS}, got {preconditioner!r}")
+    n = grid_size
+    r = residual(v, n, rhs)
+    z = precondition(r, n, preconditioner)
+    p = np.zeros((n + 2, n + 2))  # Search direction, zero on the boundary
+    p[1:n + 1, 1:n + 1] = z
+    rz = np.sum(r * z)
+    residual_history = [np.max(np.abs(r)) / 4]
+
+    iterations = 0
+    while residual_history[-1] >= tolerance and iterations < nsteps:
+        Ap = apply_laplacian(p, n)
+        alpha = rz / np.sum(p[1:n + 1, 1:n + 1] * Ap)
+        v[1:n + 1, 1:n + 1] += alpha * p[1:n + 1, 1:n + 1]
+        r -= alpha * Ap
+        z = precondition(r, n, preconditioner)
+        rz_new = np.sum(r * z)
+        p[1:n + 1, 1:n + 1] = z + (rz_new / rz) * p[1:n + 1, 1:n + 1]
+        rz = rz_new
+        iterations += 1
+        residual_history.append(np.max(np.abs(r)) / 4)
+
+    return iterations, v, residual_history
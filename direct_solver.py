@@ -0,0 +1,43 @@
+import numpy as np
+
+# Function to compute the type-I discrete sine transform along one axis
+def dst1(x, axis=-1):
+    """
+    X_k = sum_j x_j sin(pi j k / (N + 1)) for j, k = 1..N, computed with a
+    real FFT of length 2(N + 1). Applying it twice gives (N + 1) / 2 times
+    the input, so idst1 is the same transform rescaled.
+    """
+    x = np.moveaxis(x, axis, -1)
+    N = x.shape[-1]
+    padded = np.zeros(x.shape[:-1] + (2 * (N + 1),))
+    padded[..., 1:N + 1] = x
+    return np.moveaxis(-np.fft.rfft(padded)[..., 1:N + 1].imag, -1, axis)
+
+# Function to invert dst1
+def idst1(X, axis=-1):
+    return dst1(X, axis) * (2.0 / (X.shape[axis] + 1))
+
+# Function to compute the eigenvalues of the 1-D second difference with Dirichlet ends
+def laplacian_eigenvalues(n):
+    return 2.0 - 2.0 * np.cos(np.pi * np.arange(1, n + 1) / (n + 1))
+
+# Function to solve Laplace's (or Poisson's) equation directly with sine transforms
+def solve_laplace_dst(v, n, rhs=None):
+    """
+    Fill the interior of v with the exact solution of the 5-point equations
+    4 v[i, j] - (sum of neighbours) = rhs[i, j] for the boundary stored in v.
+    The sine transform diagonalises the operator, so the cost is
+    O(N log N) with no iterations or tolerance. Returns v.
+    """
+    b = np.zeros((n, n)) if rhs is None else np.array(rhs[1:n + 1, 1:n + 1], dtype=float)
+    # Move the known boundary neighbours to the right hand side
+    b[0, :] += v[0, 1:n + 1]    # Top boundary
+    b[-1, :] += v[-1, 1:n + 1]  # Bottom boundary
+    b[:, 0] += v[1:n + 1, 0]    # Left boundary
+    b[:, -1] += v[1:n + 1, -1]  # Right boundary
+
+    eigenvalues = laplacian_eigenvalues(n)
+    b_hat = dst1(dst1(b, 0), 1)
+    u_hat = b_hat / (eigenvalues[:, None] + eigenvalues[None, :])
+    v[1:n + 1, 1:n + 1] = idst1(idst1(u_hat, 0), 1)
+    return v
@@ -1,5 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from laplace_solver import relax_gauss_seidel
+from random_walks import sample_boundary_values, path_reuse_estimate
 
 # Function to initialize the grid with custom boundary conditions
 def initialize_grid_with_custom_boundary(n, left=5, top=10, right=5, bottom=10, center_value=7.5):
@@ -10,20 +12,17 @@ def initialize_grid_with_custom_boundary(n, left=5, top=10, right=5, bottom=10,
     v[-1, :] = bottom # Bottom boundary
     return v
 
-# Gauss-Seidel relaxation function
-def relax_gauss_seidel(v, n):
-    for i in range(1, n + 1):
-        for j in range(1, n + 1):
-            v[i, j] = 0.25 * (v[i + 1, j] + v[i - 1, j] + v[i, j + 1] + v[i, j - 1])
-
 # Function to solve Laplace's equation numerically
 def solve_laplace_gauss_seidel(n, tolerance=1e-3, max_iterations=10000):
     v = initialize_grid_with_custom_boundary(n)
+    # Buffers for the previous sweep and the change, allocated once
+    old_v = v.copy()
+    change = np.empty((n, n))
     iterations = 0
     while iterations < max_iterations:
-        old_v = v.copy()
+        np.copyto(old_v, v)
         relax_gauss_seidel(v, n)
-        max_error = np.max(np.abs(v - old_v))
+        max_error = np.max(np.abs(np.subtract(v[1:-1, 1:-1], old_v[1:-1, 1:-1], out=change), out=change))
         iterations += 1
         if max_error < tolerance:
             break
@@ -31,23 +30,8 @@ def solve_laplace_gauss_seidel(n, tolerance=1e-3, max_iterations=10000):
     return v
 
 # Random walk simulation functions
-def random_walk(grid, x0, y0):
-    x, y = x0, y0
-    n, m = grid.shape
-    while 0 < x < n - 1 and 0 < y < m - 1:  # Stay within the interior of the grid
-        step = np.random.choice(["up", "down", "left", "right"])
-        if step == "up":
-            x -= 1
-        elif step == "down":
-            x += 1
-        elif step == "left":
-            y -= 1
-        elif step == "right":
-            y += 1
-    return grid[x, y]
-
 def estimate_potential(grid, start_x, start_y, num_walks):
-    boundary_values = [random_walk(grid, start_x, start_y) for _ in range(num_walks)]
+    boundary_values = sample_boundary_values(grid, start_x, start_y, num_walks)
     return np.mean(boundary_values)
 
 def run_random_walks(n, num_walks):
@@ -59,6 +43,12 @@ def run_random_walks(n, num_walks):
             potential[i, j] = estimate_potential(grid, i, j, num_walks)
     return potential
 
+# Estimate the whole potential grid from one shared budget of num_walks walks
+def run_random_walks_path_reuse(n, num_walks):
+    grid = initialize_grid_with_custom_boundary(n)
+    potential, sample_counts = path_reuse_estimate(grid, num_walks)
+    return potential, sample_counts
+
 # Main comparison script
 if __name__ == "__main__":
     n = 20  # Grid size (interior points)
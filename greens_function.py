@@ -0,0 +1,133 @@
+import os
+
+import numpy as np
+from random_walks import walk_on_squares, walk_to_boundary, step_source
+from parallel_walks import parallel_walk_exits
+
+# Function to list the perimeter cells of a grid
+def perimeter_indices(shape):
+    """
+    Row and column indices of every cell on the outermost rows and columns,
+    in row-major order.
+    """
+    on_boundary = np.ones(shape, dtype=bool)
+    on_boundary[1:-1, 1:-1] = False
+    return np.nonzero(on_boundary)
+
+# Function to calculate the potential from a dense Green's function
+def calculate_potential(green_function, boundary_potential):
+    """
+    Use the Green's function G[x, y, xb, yb] to calculate the potential
+    V(x, y) = sum over boundary cells of G[x, y, xb, yb] * boundary_potential[xb, yb].
+    The perimeter is extracted once and contracted with the interior of G
+    in a single einsum over the perimeter axis. boundary_potential may
+    carry leading batch dimensions, (..., n, m), to evaluate many boundary
+    conditions in one call.
+    """
+    n, m = green_function.shape[:2]
+    boundary_potential = np.asarray(boundary_potential)
+    xb, yb = perimeter_indices((n, m))
+    green_perimeter = green_function[1:-1, 1:-1][:, :, xb, yb]             # (n-2, m-2, perimeter)
+    values = boundary_potential[..., xb, yb]                                # (..., perimeter)
+
+    potential = np.zeros(boundary_potential.shape[:-2] + (n, m), dtype=float)
+    potential[..., 1:-1, 1:-1] = np.einsum("xyp,...p->...xy", green_perimeter, values)
+    return potential
+
+# Function to count where walks from every interior cell leave the grid
+def compute_greens_counts(shape, num_walks, rng=None, method="lattice", dtype=np.int32, sparse=False,
+                          chunk_size=1 << 22, workers=None):
+    """
+    Compact Green's function: counts[i, p] is how many of the num_walks
+    walks started at interior cell i (row-major) left the grid through
+    perimeter cell p (in perimeter_indices order). Only the perimeter can
+    be reached, so this takes O(n^3) memory instead of the O(n^4) dense
+    G[x, y, xb, yb]. Counts are kept unnormalised, so the matrices of two
+    independent runs can simply be added to merge them.
+    dtype may be an integer type or np.float32; sparse=True returns a
+    scipy.sparse CSR matrix instead of a dense array. method is passed on
+    to choose between lattice walks and walk-on-squares jumps. With
+    workers set, every chunk of at most chunk_size walks runs on a process
+    pool (parallel_walk_exits) and rng must be a seed, so results do not
+    depend on the pool size.
+    """
+    n, m = shape
+    xb, yb = perimeter_indices(shape)
+    perimeter = xb.size
+    column = np.full(n * m, -1, dtype=np.int64)
+    column[xb * m + yb] = np.arange(perimeter)
+    walk = walk_on_squares if method == "squares" else walk_to_boundary
+    interior = (n - 2) * (m - 2)
+    cells_per_chunk = max(1, chunk_size // num_walks)
+    chunks = range(0, interior, cells_per_chunk)
+    if workers is None:
+        source = step_source(rng)
+    else:
+        # One seed per chunk, so the chunks stay independent and the result does not depend on workers
+        root = rng if isinstance(rng, np.random.SeedSequence) else np.random.SeedSequence(rng)
+        seeds = root.spawn(len(chunks))
+    rows, cols, values = [], [], []
+    for index, first in enumerate(chunks):
+        cells = np.arange(first, min(first + cells_per_chunk, interior))
+        start = np.repeat(cells, num_walks)
+        if workers is not None:
+            exit_x, exit_y = parallel_walk_exits(shape, cells // (m - 2) + 1, cells % (m - 2) + 1, num_walks,
+                                                 seeds[index], workers, method=method)
+            exit_x, exit_y = exit_x.ravel().astype(np.int64), exit_y.ravel().astype(np.int64)
+        else:
+            exit_x, exit_y, _ = walk((n, m), start // (m - 2) + 1, start % (m - 2) + 1, start.size, source)
+        key = start * perimeter + column[exit_x * m + exit_y]
+        key, count = np.unique(key, return_counts=True)
+        rows.append(key // perimeter)
+        cols.append(key % perimeter)
+        values.append(count)
+    rows, cols, values = np.concatenate(rows), np.concatenate(cols), np.concatenate(values).astype(dtype)
+
+    if sparse:
+        from scipy.sparse import csr_matrix
+        return csr_matrix((values, (rows, cols)), shape=(interior, perimeter))
+    counts = np.zeros((interior, perimeter), dtype=dtype)
+    counts[rows, cols] = values
+    return counts
+
+# Function to calculate the potential from compact Green's function counts
+def greens_potential(counts, boundary_potential):
+    """
+    Normalise each row of counts to exit probabilities and weight the
+    perimeter values with them. boundary_potential is an (n, m) grid, or a
+    stack (..., n, m) of them; the result has the same shape with the
+    boundary values kept and the interior filled in.
+    """
+    boundary_potential = np.asarray(boundary_potential, dtype=float)
+    shape = boundary_potential.shape[-2:]
+    xb, yb = perimeter_indices(shape)
+    values = boundary_potential[..., xb, yb].reshape(-1, xb.size)        # (batch, perimeter)
+    walks = np.asarray(counts.sum(axis=1), dtype=float).ravel()
+
+    interior = np.asarray(counts @ values.T, dtype=float) / walks[:, None]   # (interior, batch)
+    potential = boundary_potential.copy()
+    potential[..., 1:-1, 1:-1] = interior.T.reshape(boundary_potential.shape[:-2] + (shape[0] - 2, shape[1] - 2))
+    return potential
+
+# Function to load the Green's function counts from disk, computing and saving them on a miss
+def cached_greens_counts(shape, num_walks, cache_dir="greens_cache", rng=None, method="lattice", dtype=np.int32,
+                         workers=None):
+    """
+    The exit counts only depend on the grid geometry, so they are stored in
+    cache_dir as a .npy file keyed by grid shape, walks per cell, walk
+    method and count dtype. Later calls memory-map the file read-only
+    instead of running the walks again, which turns a new boundary
+    condition into one greens_potential call. The file is written to a
+    temporary name and renamed, so an interrupted run never leaves a
+    truncated cache entry.
+    """
+    n, m = shape
+    path = os.path.join(cache_dir, f"greens_{n}x{m}_{num_walks}_{method}_{np.dtype(dtype).name}.npy")
+    if not os.path.exists(path):
+        counts = compute_greens_counts(shape, num_walks, rng, method, dtype, workers=workers)
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            np.save(file, counts)
+        os.replace(temporary, path)
+    return np.load(path, mmap_mode="r")
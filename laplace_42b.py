@@ -1,12 +1,12 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import animation
+from laplace_solver import relax_normal
+from superposition import solve_superposition
 
 # Function to relax the grid
 def relax(grid, grid_new, n):
-    for i in range(1, n + 1):
-        for j in range(1, n + 1):
-            grid_new[i, j] = 0.25 * (grid[i + 1, j] + grid[i - 1, j] + grid[i, j + 1] + grid[i, j - 1])
+    relax_normal(grid, grid_new, n)
 
 # Function to calculate the maximum error
 def calculate_error(grid, grid_new, n):
@@ -26,7 +26,19 @@ def initialize_grid_with_custom_boundary(n, left=5, top=10, right=5, bottom=10,
     return v, vnew
 
 # Perform the relaxation method with animation
-def animate_relaxation(v, vnew, n, tolerance=0.01, nsteps=1000):
+# With solver="superposition" the converged grid for the sides of v is shown and returned without relaxing
+def animate_relaxation(v, vnew, n, tolerance=0.01, nsteps=1000, solver="jacobi"):
+    if solver == "superposition":
+        # The converged grid is shown straight away, built from the cached unit-side solutions
+        left, top, right, bottom = v[1, 0], v[0, 1], v[1, -1], v[-1, 1]
+        v = solve_superposition(n, left, top, right, bottom)
+        fig, ax = plt.subplots()
+        im = ax.imshow(v, cmap='hot', interpolation='nearest', origin='lower')
+        plt.colorbar(im, ax=ax, label="Potential")
+        ax.set_title(f"Superposition Solution\nBoundary: Left={left}, Top={top}, Right={right}, Bottom={bottom}")
+        plt.show()
+        return v
+
     fig, ax = plt.subplots()
     im = ax.imshow(v, cmap='hot', interpolation='nearest', origin='lower')
     ax.set_title("Relaxation Animation")
@@ -0,0 +1,302 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Function to relax the grid using Jacobi method (normal updates)
+def relax_normal(grid, grid_new, n, rhs=None, scratch=None):
+    """
+    Perform one Jacobi step on the interior of an (n+2)x(n+2) grid, or of
+    every grid of a (batch, n+2, n+2) stack.
+    The whole interior is updated with array slices, adding the four
+    neighbours in the same order as the per-cell loop so the numbers match.
+    rhs is an optional grid of h^2 times the source term (Poisson's equation).
+    scratch is an optional interior-sized array for the neighbour sum; with
+    it the step allocates nothing.
+    """
+    total = np.add(grid[..., 2:n + 2, 1:n + 1], grid[..., 0:n, 1:n + 1], out=scratch)
+    total += grid[..., 1:n + 1, 2:n + 2]
+    total += grid[..., 1:n + 1, 0:n]
+    if rhs is not None:
+        total += rhs[..., 1:n + 1, 1:n + 1]
+    # Unsafe casting truncates into integer grids, as a plain assignment would
+    np.multiply(total, 0.25, out=grid_new[..., 1:n + 1, 1:n + 1], casting="unsafe")
+
+# Function to measure the change between two Jacobi iterates without allocating
+def _jacobi_change(new, old, n, scratch, error):
+    np.subtract(new[1:n + 1, 1:n + 1], old[1:n + 1, 1:n + 1], out=scratch)
+    if error == "max":
+        return np.max(np.abs(scratch, out=scratch))
+    return np.sqrt(np.sum(np.square(scratch, out=scratch)) / scratch.size)
+
+# Function to run Jacobi sweeps between two fixed buffers, checking convergence only now and then
+def run_jacobi(v, n, tolerance=1e-3, nsteps=10000, check_every="auto", error="max", rhs=None):
+    """
+    Same result as the usual loop (relax_normal into v_new, measure the
+    change, copy v_new back into v, stop once the change is below
+    tolerance) without its copy-back: the two buffers swap roles after
+    every sweep and nothing is allocated inside the loop.
+    The change (largest, or root-mean-square for error="rms") is only
+    measured every check_every sweeps; "auto" starts at 1 and then spaces
+    the checks to about half the sweeps the observed convergence rate
+    still predicts. The grid is saved at every failed check, and once a
+    check passes the sweeps since the last save are replayed one by one,
+    so the iteration count and the final grid are exactly those of the
+    per-sweep loop.
+    Returns the number of iterations (sweeps before the converged one, or
+    nsteps) and v, which holds the final grid.
+    """
+    if error not in ("max", "rms"):
+        raise ValueError(f"error must be 'max' or 'rms', got {error!r}")
+    current, other = v, v.copy()
+    saved = v.copy()
+    scratch = np.empty((n, n))
+    sweeps = saved_sweeps = 0
+    step = 1 if check_every == "auto" else check_every
+    last_error = None
+    while True:
+        target = min(sweeps + step, nsteps)
+        while sweeps < target:
+            relax_normal(current, other, n, rhs, scratch)
+            current, other = other, current
+            sweeps += 1
+        change = _jacobi_change(current, other, n, scratch, error)
+        if change < tolerance and step > 1:
+            # Converged somewhere after the last save: replay those sweeps with a check after each
+            np.copyto(current, saved)
+            sweeps, step = saved_sweeps, 1
+            continue
+        if change < tolerance:
+            iterations = sweeps - 1
+            break
+        if sweeps >= nsteps:
+            iterations = nsteps
+            break
+        np.copyto(saved, current)
+        if check_every == "auto":
+            if last_error is not None and change < last_error[1]:
+                rate = (change / last_error[1]) ** (1 / (sweeps - last_error[0]))
+                step = int(np.clip(0.5 * np.log(tolerance / change) / np.log(rate), 1, 64))
+            last_error = (sweeps, change)
+        saved_sweeps = sweeps
+    if current is not v:
+        np.copyto(v, current)
+    return iterations, v
+
+# Function to list the anti-diagonals of the interior as flat slices
+@lru_cache(maxsize=None)
+def _diagonals(n):
+    """
+    Cells on one anti-diagonal (i + j constant) only depend on the two
+    neighbouring diagonals, so sweeping diagonal by diagonal reproduces
+    the row-by-row Gauss-Seidel order exactly. In the flattened grid the
+    cells of a diagonal are n + 1 apart, so each one is a plain slice.
+    """
+    width = n + 2
+    diagonals = []
+    for k in range(2, 2 * n + 1):
+        first, last = max(1, k - n), min(n, k - 1)
+        diagonals.append((first * width + k - first, last * width + k - last + 1))
+    return diagonals
+
+# Function to relax the grid using Gauss-Seidel method (sequential updates)
+def relax_gauss_seidel(v, n, rhs=None):
+    """
+    Update the potential grid using the Gauss-Seidel method.
+    Updates are applied sequentially, immediately using the most recent values.
+    Returns the largest residual of the grid as it was before the sweep
+    (the value calculate_error_gauss_seidel used to measure in a second pass),
+    recovered on the fly by subtracting the changes already made upstream.
+    v may also be a (batch, n+2, n+2) stack; every grid is swept and one
+    residual per grid is returned.
+    rhs is an optional grid of h^2 times the source term (Poisson's equation).
+    """
+    if not v.flags.c_contiguous:
+        raise ValueError("relax_gauss_seidel needs a C-contiguous grid")
+    width = n + 2
+    flat = v.reshape(v.shape[:-2] + (-1,))
+    flat_rhs = None if rhs is None else rhs.reshape(rhs.shape[:-2] + (-1,))
+    step = n + 1
+    # Residuals are stored in place of their cells and reduced once at the end
+    residuals = np.zeros(flat.shape)
+    change = np.zeros(flat.shape[:-1] + (0,))
+    edge = np.zeros(flat.shape[:-1] + (1,))
+    for k, (start, stop) in enumerate(_diagonals(n), start=2):
+        total = (flat[..., start + width:stop + width:step] + flat[..., start - width:stop - width:step]
+                 + flat[..., start + 1:stop + 1:step] + flat[..., start - 1:stop - 1:step])
+        if flat_rhs is not None:
+            total += flat_rhs[..., start:stop:step]
+        updated_value = 0.25 * total
+        site = flat[..., start:stop:step]
+        # Changes of the upper and left neighbours, zero where they are boundary cells
+        if k <= n + 1:
+            change = np.concatenate((edge, change, edge), axis=-1)
+        residuals[..., start:stop:step] = updated_value - site - 0.25 * (change[..., :-1] + change[..., 1:])
+        change = updated_value - site
+        site[...] = updated_value
+    return np.max(np.abs(residuals), axis=-1)
+
+# Function to compute the spectral radius of the Jacobi iteration on the rectangular Dirichlet box
+def jacobi_spectral_radius(n, m=None):
+    if m is None:
+        m = n
+    return 0.5 * (np.cos(np.pi / (n + 1)) + np.cos(np.pi / (m + 1)))
+
+# Function to find the near-optimal SOR factor for the rectangular Dirichlet box
+def optimal_omega(n, m=None):
+    """
+    Return the optimal over-relaxation factor for an n x m interior with
+    fixed boundary values, from the spectral radius of the Jacobi iteration.
+    """
+    rho = jacobi_spectral_radius(n, m)
+    return 2.0 / (1.0 + np.sqrt(1.0 - rho ** 2))
+
+# Function to run Jacobi with Chebyshev semi-iterative acceleration
+def run_jacobi_chebyshev(v, n, tolerance=1e-3, nsteps=10000, rhs=None):
+    """
+    Every step is still one order-independent Jacobi sweep J, combined
+    with the iterate before it:
+        v_(k+1) = v_(k-1) + w_(k+1) * (J v_k - v_(k-1)),
+        w_1 = 1, w_2 = 1 / (1 - rho^2 / 2), w_(k+1) = 1 / (1 - rho^2 w_k / 4)
+    with rho = jacobi_spectral_radius(n). The weights make the error the
+    best Chebyshev polynomial over the Jacobi spectrum [-rho, rho], which
+    takes O(n) instead of O(n^2) sweeps. The two iterates swap buffers and
+    nothing is allocated inside the loop.
+    The convergence test is the residual max |0.25 * (sum of neighbours)
+    - v| before a step, as in run_relaxation_gauss, and comes for free
+    from the sweep. Returns the number of iterations and v.
+    """
+    rho = jacobi_spectral_radius(n)
+    current, previous = v, v.copy()
+    sweep = np.empty((n, n))
+    difference = np.empty((n, n))
+    omega = 1.0
+    iterations = 0
+    while iterations < nsteps:
+        np.add(current[2:n + 2, 1:n + 1], current[0:n, 1:n + 1], out=sweep)
+        sweep += current[1:n + 1, 2:n + 2]
+        sweep += current[1:n + 1, 0:n]
+        if rhs is not None:
+            sweep += rhs[1:n + 1, 1:n + 1]
+        sweep *= 0.25
+        np.subtract(sweep, current[1:n + 1, 1:n + 1], out=difference)
+        if np.max(np.abs(difference, out=difference)) < tolerance:
+            break
+        # The first step is a plain Jacobi sweep, later ones extrapolate from the iterate before
+        if iterations == 1:
+            omega = 1.0 / (1.0 - 0.5 * rho ** 2)
+        elif iterations > 1:
+            omega = 1.0 / (1.0 - 0.25 * rho ** 2 * omega)
+        interior = previous[1:n + 1, 1:n + 1]
+        sweep -= interior
+        sweep *= omega
+        interior += sweep
+        current, previous = previous, current
+        iterations += 1
+    if current is not v:
+        np.copyto(v, current)
+    return iterations, v
+
+# Function to update one colour of the checkerboard in a single slice operation
+def _relax_color(v, n, row, col, omega, rhs, change):
+    """
+    Update the sites whose row starts at `row` and column starts at `col`,
+    stepping by two in both directions. Returns the largest residual of
+    the updated sites of each grid as it was before the sweep: the red
+    sites store their changes in `change`, and the black sites subtract
+    the part of their correction that comes from those changes.
+    """
+    site = (..., slice(row, n + 1, 2), slice(col, n + 1, 2))
+    total = (v[..., row + 1:n + 2:2, col:n + 1:2] + v[..., row - 1:n:2, col:n + 1:2]
+             + v[..., row:n + 1:2, col + 1:n + 2:2] + v[..., row:n + 1:2, col - 1:n:2])
+    if rhs is not None:
+        total += rhs[site]
+    updated_value = 0.25 * total
+    if updated_value.size == 0:
+        return np.zeros(v.shape[:-2])[()]
+    correction = updated_value - v[site]
+    if (row + col) % 2:
+        upstream = (change[..., row + 1:n + 2:2, col:n + 1:2] + change[..., row - 1:n:2, col:n + 1:2]
+                    + change[..., row:n + 1:2, col + 1:n + 2:2] + change[..., row:n + 1:2, col - 1:n:2])
+        max_error = np.max(np.abs(correction - 0.25 * upstream), axis=(-2, -1))
+    else:
+        max_error = np.max(np.abs(correction), axis=(-2, -1))
+        change[site] = omega * correction
+    if omega == 1:
+        v[site] = updated_value
+    else:
+        v[site] = (1 - omega) * v[site] + omega * updated_value
+    return max_error
+
+# Function to relax the grid using the checkerboard method
+def relax_checkerboard(v, n, omega=1.0, rhs=None):
+    """
+    Update the grid using the checkerboard method:
+    - Update red sites first (i + j is even).
+    - Update black sites next (i + j is odd).
+    Each colour is updated with strided slices. omega > 1 gives successive
+    over-relaxation, omega="auto" picks optimal_omega(n).
+    rhs is an optional grid of h^2 times the source term (Poisson's equation).
+    Returns the largest residual of the grid as it was before the sweep,
+    like relax_gauss_seidel, one per grid when v is a (batch, n+2, n+2)
+    stack.
+    """
+    if omega == "auto":
+        omega = optimal_omega(n)
+    # Changes of the red sites, zero elsewhere
+    change = np.zeros(v.shape)
+    # Update red sites
+    max_error = np.maximum(_relax_color(v, n, 1, 1, omega, rhs, change), _relax_color(v, n, 2, 2, omega, rhs, change))
+    # Update black sites
+    max_error = np.maximum(max_error, _relax_color(v, n, 1, 2, omega, rhs, change))
+    return np.maximum(max_error, _relax_color(v, n, 2, 1, omega, rhs, change))
+
+# Function to calculate the maximum error based on the difference between old and new values
+def calculate_error_gauss_seidel(v, n):
+    """
+    Compute the largest change one more relaxation step would make to any
+    interior cell, i.e. max |0.25 * (sum of neighbours) - v|, one value per
+    grid of a (batch, n+2, n+2) stack.
+    """
+    updated_value = 0.25 * (v[..., 2:n + 2, 1:n + 1] + v[..., 0:n, 1:n + 1]
+                            + v[..., 1:n + 1, 2:n + 2] + v[..., 1:n + 1, 0:n])
+    return np.max(np.abs(updated_value - v[..., 1:n + 1, 1:n + 1]), axis=(-2, -1))
+
+# Function to relax every grid of a stack until it converges, freezing converged grids
+def run_relaxation_batch(v, n, method="gauss_seidel", tolerance=1e-3, nsteps=10000, omega=1.0):
+    """
+    Sweep a (batch, n+2, n+2) stack with "jacobi", "gauss_seidel" or
+    "checkerboard" (omega as in relax_checkerboard), all members at once.
+    Each member has its own convergence test, the same one the single-grid
+    loops use: the largest Jacobi change, or for Gauss-Seidel and
+    checkerboard the residual before the sweep (so their grids have had
+    one sweep more than counted). A member whose test passes is written
+    back to v and dropped from the working stack, so converged members
+    are frozen and cost nothing in later sweeps.
+    Returns the iterations of every member and v.
+    """
+    if method not in ("jacobi", "gauss_seidel", "checkerboard"):
+        raise ValueError(f"method must be 'jacobi', 'gauss_seidel' or 'checkerboard', got {method!r}")
+    iterations = np.zeros(v.shape[0], dtype=np.int64)
+    active = np.arange(v.shape[0])
+    work = np.ascontiguousarray(v, dtype=float)
+    work_new = work.copy() if method == "jacobi" else None
+    for _ in range(nsteps):
+        if method == "jacobi":
+            relax_normal(work, work_new, n)
+            error = np.max(np.abs(work_new[:, 1:-1, 1:-1] - work[:, 1:-1, 1:-1]), axis=(-2, -1))
+            work[:, 1:-1, 1:-1] = work_new[:, 1:-1, 1:-1]
+        elif method == "gauss_seidel":
+            error = relax_gauss_seidel(work, n)
+        else:
+            error = relax_checkerboard(work, n, omega)
+        converged = error < tolerance
+        iterations[active[~converged]] += 1
+        if converged.any():
+            v[active[converged]] = work[converged]
+            keep = ~converged
+            active, work = active[keep], work[keep]
+            work_new = None if work_new is None else work_new[keep]
+            if not active.size:
+                break
+    v[active] = work
+    return iterations, v
@@ -0,0 +1,164 @@
+from functools import lru_cache
+
+import numpy as np
+from laplace_solver import relax_normal, relax_gauss_seidel, relax_checkerboard, calculate_error_gauss_seidel
+
+SMOOTHERS = ("jacobi", "gauss_seidel", "checkerboard")
+
+# Function to list the grid sizes from the finest to the coarsest level
+def grid_levels(n, coarsest=3):
+    """
+    Halve the number of interior points until it drops to `coarsest`.
+    Odd n coarsen exactly (n = 2 * nc + 1); even n use a coarse grid whose
+    points do not coincide with fine points, handled by the interpolation.
+    """
+    levels = [n]
+    while levels[-1] > coarsest:
+        levels.append(levels[-1] // 2)
+    return tuple(levels)
+
+# Function to build the 1-D linear interpolation from a coarse grid to a fine grid
+@lru_cache(maxsize=None)
+def _interpolation_weights(n, nc):
+    """
+    For every fine node 1..n return the coarse node to its left and the
+    weight of the coarse node to its right. Both grids span the same
+    interval with n and nc interior points, so integer arithmetic gives
+    exact weights whenever the nodes coincide.
+    """
+    position = np.arange(1, n + 1) * (nc + 1)
+    left = position // (n + 1)
+    weight = (position % (n + 1)) / (n + 1)
+    starts = np.searchsorted(left, np.arange(nc + 1))
+    # Sum of the weights each coarse interior node receives, used to normalise the restriction
+    total = np.add.reduceat(1 - weight, starts)[1:] + np.add.reduceat(weight, starts)[:-1]
+    return left, weight, starts, total
+
+# Function to interpolate a padded coarse grid onto the fine interior
+def prolong(coarse, n):
+    """
+    Bilinear interpolation of an (nc+2)x(nc+2) grid, boundary included,
+    onto the n x n interior of the fine grid.
+    """
+    left, weight, _, _ = _interpolation_weights(n, coarse.shape[0] - 2)
+    rows = (1 - weight)[:, None] * coarse[left] + weight[:, None] * coarse[left + 1]
+    return (1 - weight) * rows[:, left] + weight * rows[:, left + 1]
+
+# Function to restrict a fine interior array to the coarse interior
+def restrict(fine, nc):
+    """
+    Transpose of prolong, normalised so a constant field stays constant.
+    For odd n this is the usual full-weighting restriction.
+    """
+    n = fine.shape[0]
+    left, weight, starts, total = _interpolation_weights(n, nc)
+    rows = np.add.reduceat((1 - weight)[:, None] * fine, starts, axis=0)[1:]
+    rows += np.add.reduceat(weight[:, None] * fine, starts, axis=0)[:-1]
+    rows /= total[:, None]
+    coarse = np.add.reduceat((1 - weight) * rows, starts, axis=1)[:, 1:]
+    coarse += np.add.reduceat(weight * rows, starts, axis=1)[:, :-1]
+    coarse /= total
+    return coarse
+
+# Function to calculate the residual of the scaled equation 4v - (sum of neighbours) = rhs
+def residual(v, n, rhs=None):
+    r = v[2:n + 2, 1:n + 1] + v[0:n, 1:n + 1] + v[1:n + 1, 2:n + 2] + v[1:n + 1, 0:n] - 4 * v[1:n + 1, 1:n + 1]
+    if rhs is not None:
+        r += rhs[1:n + 1, 1:n + 1]
+    return r
+
+# Function to apply a number of smoothing sweeps
+def smooth(v, n, rhs, smoother, sweeps):
+    """
+    Jacobi is damped by 4/5, which makes it a proper smoother for the
+    high-frequency error; Gauss-Seidel and checkerboard are used as is.
+    """
+    if smoother == "jacobi":
+        v_new = v.copy()
+        for _ in range(sweeps):
+            relax_normal(v, v_new, n, rhs)
+            v[1:n + 1, 1:n + 1] += 0.8 * (v_new[1:n + 1, 1:n + 1] - v[1:n + 1, 1:n + 1])
+    elif smoother == "gauss_seidel":
+        for _ in range(sweeps):
+            relax_gauss_seidel(v, n, rhs)
+    else:
+        for _ in range(sweeps):
+            relax_checkerboard(v, n, rhs=rhs)
+
+# Function to perform one multigrid V-cycle
+def v_cycle(v, levels, rhs=None, smoother="checkerboard", pre_sweeps=2, post_sweeps=2, coarse_sweeps=50):
+    """
+    Smooth, move the residual to the next coarser grid, solve for the
+    correction there recursively, interpolate it back and smooth again.
+    levels[0] is the size of v; the coarsest level is only smoothed.
+    """
+    n = levels[0]
+    if len(levels) == 1:
+        smooth(v, n, rhs, smoother, coarse_sweeps)
+        return
+    smooth(v, n, rhs, smoother, pre_sweeps)
+
+    nc = levels[1]
+    coarse_rhs = np.zeros((nc + 2, nc + 2))
+    coarse_rhs[1:-1, 1:-1] = ((n + 1) / (nc + 1)) ** 2 * restrict(residual(v, n, rhs), nc)
+    correction = np.zeros((nc + 2, nc + 2))
+    v_cycle(correction, levels[1:], coarse_rhs, smoother, pre_sweeps, post_sweeps, coarse_sweeps)
+    v[1:n + 1, 1:n + 1] += prolong(correction, n)
+
+    smooth(v, n, rhs, smoother, post_sweeps)
+
+# Function to sample the boundary of a grid onto a coarser grid
+def coarsen_boundary(v, nc):
+    """
+    Return an (nc+2)x(nc+2) grid with the boundary of v linearly
+    interpolated onto the coarse points and a zero interior.
+    """
+    n = v.shape[0] - 2
+    fine_points = np.arange(n + 2)
+    coarse_points = np.arange(nc + 2) * (n + 1) / (nc + 1)
+    coarse = np.zeros((nc + 2, nc + 2))
+    coarse[:, 0] = np.interp(coarse_points, fine_points, v[:, 0])    # Left boundary
+    coarse[0, :] = np.interp(coarse_points, fine_points, v[0, :])    # Top boundary
+    coarse[:, -1] = np.interp(coarse_points, fine_points, v[:, -1])  # Right boundary
+    coarse[-1, :] = np.interp(coarse_points, fine_points, v[-1, :])  # Bottom boundary
+    return coarse
+
+# Function to perform full multigrid (nested iteration) for Laplace's equation
+def full_multigrid(v, levels, smoother="checkerboard", cycles=1):
+    """
+    Solve the problem on the coarsest grid first, interpolate each
+    solution up as the starting guess for the next finer grid and
+    finish every level with `cycles` V-cycles.
+    """
+    if len(levels) > 1:
+        coarse = coarsen_boundary(v, levels[1])
+        full_multigrid(coarse, levels[1:], smoother, cycles)
+        v[1:-1, 1:-1] = prolong(coarse, levels[0])
+    for _ in range(cycles):
+        v_cycle(v, levels, smoother=smoother)
+
+# Function to run multigrid V-cycles until the grid has converged
+def run_relaxation_multigrid(v, grid_size, left=10, top=10, right=10, bottom=0, tolerance=1e-3, nsteps=10000,
+                             smoother="checkerboard", fmg=False):
+    """
+    Same inputs and convergence test as run_relaxation_gauss, but every
+    iteration is a V-cycle. With fmg=True a full multigrid pass (counted
+    as one iteration) provides the starting guess.
+    Returns the number of iterations and the final grid.
+    """
+    if smoother not in SMOOTHERS:
+        raise ValueError(f"smoother must be one of {SMOOTHERS}, got {smoother!r}")
+    n = grid_size
+    levels = grid_levels(n)
+    iterations = 0
+    if fmg:
+        full_multigrid(v, levels, smoother)
+        iterations += 1
+    while iterations < nsteps:
+        max_error = calculate_error_gauss_seidel(v, n)
+        if max_error < tolerance:
+            break
+        v_cycle(v, levels, smoother=smoother)
+        iterations += 1
+
+    return iterations, v
@@ -0,0 +1,56 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from random_walks import walk_on_squares, walk_to_boundary
+
+# Function run by a worker: walk one slice of the (point, walk) list to the boundary
+def _walk_task(shape, start_x, start_y, num_walks, first, last, seed_sequence, method):
+    """
+    Walkers first..last-1 of the flattened list where walker k starts at
+    point k // num_walks. The task owns its own random stream, so its
+    result does not depend on which process runs it.
+    """
+    point = np.arange(first, last) // num_walks
+    walk = walk_on_squares if method == "squares" else walk_to_boundary
+    exit_x, exit_y, _ = walk(shape, start_x[point], start_y[point], last - first, np.random.default_rng(seed_sequence))
+    return exit_x.astype(np.int32), exit_y.astype(np.int32)
+
+# Function to run tasks in a process pool, or in this process when workers is 1 or None
+def run_tasks(function, tasks, workers=None):
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be None or at least 1, got {workers!r}")
+    if workers is None or workers == 1:
+        return [function(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(function, *zip(*tasks), chunksize=max(1, len(tasks) // (4 * workers))))
+
+# Function to walk num_walks walkers from every start point, split over a process pool
+def parallel_walk_exits(shape, start_x, start_y, num_walks, seed=None, workers=None, walks_per_task=100000,
+                        method="lattice"):
+    """
+    The (point, walk) pairs are cut into tasks of walks_per_task walkers
+    and every task gets its own stream spawned from SeedSequence(seed)
+    (seed may also be a SeedSequence).
+    The split depends only on the inputs, never on workers, so a given
+    seed gives bit-identical results for any number of processes.
+    Returns the exit rows and columns as (points, num_walks) arrays.
+    """
+    start_x = np.atleast_1d(np.asarray(start_x, dtype=np.int64))
+    start_y = np.atleast_1d(np.asarray(start_y, dtype=np.int64))
+    total = start_x.size * num_walks
+    bounds = list(range(0, total, walks_per_task)) + [total]
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    seeds = root.spawn(len(bounds) - 1)
+    tasks = [(shape, start_x, start_y, num_walks, first, last, seed_sequence, method)
+             for first, last, seed_sequence in zip(bounds[:-1], bounds[1:], seeds)]
+    results = run_tasks(_walk_task, tasks, workers)
+    exit_x = np.concatenate([x for x, _ in results]).reshape(start_x.size, num_walks)
+    exit_y = np.concatenate([y for _, y in results]).reshape(start_x.size, num_walks)
+    return exit_x, exit_y
+
+# Function to collect the boundary values of num_walks walks from every start point in parallel
+def parallel_boundary_values(grid, start_x, start_y, num_walks, seed=None, workers=None, walks_per_task=100000,
+                             method="lattice"):
+    exit_x, exit_y = parallel_walk_exits(grid.shape, start_x, start_y, num_walks, seed, workers, walks_per_task,
+                                         method)
+    return grid[exit_x, exit_y]
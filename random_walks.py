@@ -0,0 +1,226 @@
+from functools import lru_cache
+
+import numpy as np
+from direct_solver import solve_laplace_dst
+
+# Direction codes used by the walkers: 0 = up, 1 = down, 2 = left, 3 = right
+STEP_X = np.array([-1, 1, 0, 0])
+STEP_Y = np.array([0, 0, -1, 1])
+
+# The four 2-bit codes packed in every byte value, as one uint32 per byte
+_CODES_PER_BYTE = np.array([[(byte >> shift) & 3 for shift in (0, 2, 4, 6)] for byte in range(256)],
+                           dtype=np.uint8).view(np.uint32).ravel()
+
+class StepSource:
+    """
+    Buffered source of direction codes 0-3. A preallocated buffer is filled
+    from raw generator output, four codes per random byte, and handed out
+    in chunks. draw returns a view into the buffer that stays valid until
+    the next call. rng may be a seed or a numpy.random.Generator.
+    """
+
+    def __init__(self, rng=None, buffer_size=1 << 20):
+        self.rng = np.random.default_rng(rng)
+        self.buffer = np.empty(buffer_size - buffer_size % 32, dtype=np.uint8)
+        self.position = self.buffer.size
+
+    def _fill(self, out):
+        raw_bytes = self.rng.bit_generator.random_raw(out.size // 32).view(np.uint8)
+        np.take(_CODES_PER_BYTE, raw_bytes, out=out.view(np.uint32))
+
+    def draw(self, count):
+        if count > self.buffer.size:
+            out = np.empty(count + (-count) % 32, dtype=np.uint8)
+            self._fill(out)
+            return out[:count]
+        if self.position + count > self.buffer.size:
+            # The unused tail is discarded; the codes are independent, so this adds no bias
+            self._fill(self.buffer)
+            self.position = 0
+        codes = self.buffer[self.position:self.position + count]
+        self.position += count
+        return codes
+
+# Function to turn a seed, Generator or StepSource into a StepSource
+def step_source(rng=None):
+    return rng if isinstance(rng, StepSource) else StepSource(rng)
+
+# Function to turn a seed, Generator or StepSource into a Generator
+def generator(rng=None):
+    return rng.rng if isinstance(rng, StepSource) else np.random.default_rng(rng)
+
+# Function to mark the outermost rows and columns of a flattened grid
+def boundary_mask(shape):
+    on_boundary = np.ones(shape, dtype=bool)
+    on_boundary[1:-1, 1:-1] = False
+    return on_boundary.ravel()
+
+# Function to walk a whole population of walkers to the boundary at once
+def walk_to_boundary(shape, start_x, start_y, num_walks, rng=None):
+    """
+    Start num_walks walkers at (start_x, start_y) on a grid of the given
+    shape and move every active walker one step per round until it stands
+    on the outermost row or column. Walkers that reach the boundary are
+    dropped from the active set. start_x and start_y may be scalars or
+    arrays with one entry per walker. rng may be a seed, a Generator or
+    a StepSource.
+    Returns the exit row, exit column and number of steps of every walker.
+    """
+    n, m = shape
+    source = step_source(rng)
+    x = np.array(np.broadcast_to(start_x, num_walks), dtype=np.int64)
+    y = np.array(np.broadcast_to(start_y, num_walks), dtype=np.int64)
+    steps = np.zeros(num_walks, dtype=np.int64)
+
+    # Walkers move on flat grid indices, so a step is one lookup and one add
+    offset = STEP_X * m + STEP_Y
+    on_boundary = boundary_mask(shape)
+
+    position = x * m + y
+    active = np.flatnonzero(~on_boundary[position])
+    walker = position[active]
+    step = 0
+    while active.size:
+        step += 1
+        walker += offset[source.draw(active.size)]
+        done = on_boundary[walker]
+        if done.any():
+            finished = active[done]
+            position[finished], steps[finished] = walker[done], step
+            keep = ~done
+            active, walker = active[keep], walker[keep]
+
+    x, y = np.divmod(position, m)
+    return x, y, steps
+
+# Function to tabulate where a lattice walk leaves squares of every half-width up to max_radius
+@lru_cache(maxsize=None)
+def square_exit_table(max_radius):
+    """
+    A walk started in the centre of the square |dx|, |dy| < r leaves it
+    through one of the 8r non-corner perimeter cells. The probability of
+    each one is the discrete harmonic measure, read off the solution of
+    4w - (sum of neighbours) = 1 at the centre (zero on the perimeter) at
+    the interior neighbour of that perimeter cell.
+    The distributions for r = 1..max_radius are stored back to back: the
+    cumulative array holds (r - 1) + cdf_r, so searching for (r - 1) + u
+    with u uniform in [0, 1) samples from radius r.
+    Returns the cumulative array, the row and column offsets of every
+    entry and the index one past the end of each radius.
+    """
+    cumulative, offset_x, offset_y, ends = [], [], [], []
+    total = 0
+    for r in range(1, max_radius + 1):
+        size = 2 * r - 1
+        rhs = np.zeros((size + 2, size + 2))
+        rhs[r, r] = 1
+        w = solve_laplace_dst(np.zeros((size + 2, size + 2)), size, rhs)
+        side = np.arange(-r + 1, r)
+        probabilities = np.concatenate((w[1, 1:-1], w[-2, 1:-1], w[1:-1, 1], w[1:-1, -2]))
+        offset_x += [np.full(size, -r), np.full(size, r), side, side]      # Top, bottom, left, right
+        offset_y += [side, side, np.full(size, -r), np.full(size, r)]
+        cdf = np.cumsum(probabilities) / np.sum(probabilities)
+        cdf[-1] = 1.0
+        cumulative.append(r - 1 + cdf)
+        total += cdf.size
+        ends.append(total)
+    return (np.concatenate(cumulative), np.concatenate(offset_x), np.concatenate(offset_y), np.array(ends))
+
+# Function to walk to the boundary by jumping across the largest square around each walker
+def walk_on_squares(shape, start_x, start_y, num_walks, rng=None):
+    """
+    Instead of single steps, every walker jumps straight to the perimeter
+    of the largest square centred on it that fits inside the grid, using
+    the exact exit distribution from square_exit_table. Because the
+    lattice walk is Markov, the exit point on the grid boundary has the
+    same distribution as in walk_to_boundary, but it is reached in
+    O(log n) jumps instead of O(n^2) steps.
+    Returns the exit row, exit column and number of jumps of every walker.
+    """
+    n, m = shape
+    rng = generator(rng)
+    cumulative, offset_x, offset_y, ends = square_exit_table(max(1, (min(n, m) - 1) // 2))
+    x = np.array(np.broadcast_to(start_x, num_walks), dtype=np.int64)
+    y = np.array(np.broadcast_to(start_y, num_walks), dtype=np.int64)
+    jumps = np.zeros(num_walks, dtype=np.int64)
+
+    active = np.flatnonzero((0 < x) & (x < n - 1) & (0 < y) & (y < m - 1))
+    jump = 0
+    while active.size:
+        jump += 1
+        walker_x, walker_y = x[active], y[active]
+        radius = np.minimum(np.minimum(walker_x, n - 1 - walker_x), np.minimum(walker_y, m - 1 - walker_y))
+        entry = np.searchsorted(cumulative, radius - 1 + rng.random(active.size), side="right")
+        entry = np.minimum(entry, ends[radius - 1] - 1)  # Guard against rounding of (r - 1) + u up to r
+        walker_x += offset_x[entry]
+        walker_y += offset_y[entry]
+        x[active], y[active], jumps[active] = walker_x, walker_y, jump
+        inside = (0 < walker_x) & (walker_x < n - 1) & (0 < walker_y) & (walker_y < m - 1)
+        active = active[inside]
+
+    return x, y, jumps
+
+# Function to collect the boundary value where each walker exits
+def sample_boundary_values(grid, start_x, start_y, num_walks, rng=None, method="lattice"):
+    """
+    method="lattice" walks step by step, method="squares" uses
+    walk_on_squares; both give the same distribution of exit points.
+    """
+    if method == "squares":
+        exit_x, exit_y, _ = walk_on_squares(grid.shape, start_x, start_y, num_walks, rng)
+    else:
+        exit_x, exit_y, _ = walk_to_boundary(grid.shape, start_x, start_y, num_walks, rng)
+    return grid[exit_x, exit_y]
+
+# Function to estimate the potential of every interior cell from one shared set of walks
+def path_reuse_estimate(grid, num_walks, rng=None, batch_size=None):
+    """
+    Launch num_walks walks, started in turn from every interior cell, and
+    credit the exit value of each walk to every interior cell it passes
+    through. Only the first visit of a walk to a cell counts: by the Markov
+    property the rest of the walk from that visit is a fresh walk from the
+    cell, so every credited value is an unbiased sample of its potential.
+    Walks are processed in batches of batch_size to bound the memory of the
+    visited-cell table.
+    Returns the potential grid (boundary values included, NaN for cells no
+    walk reached) and the number of samples behind every cell.
+    """
+    n, m = grid.shape
+    source = step_source(rng)
+    offset = STEP_X * m + STEP_Y
+    on_boundary = boundary_mask(grid.shape)
+    interior = np.flatnonzero(~on_boundary)
+    if batch_size is None:
+        batch_size = max(1, (1 << 24) // (n * m))
+    sums = np.zeros(n * m)
+    counts = np.zeros(n * m, dtype=np.int64)
+
+    for first in range(0, num_walks, batch_size):
+        size = min(batch_size, num_walks - first)
+        walker_id = np.arange(size)
+        position = interior[np.arange(first, first + size) % interior.size]
+        exit_position = np.empty(size, dtype=np.int64)
+        visited = np.zeros((size, n * m), dtype=bool)
+        visited[walker_id, position] = True
+        visit_id, visit_position = [walker_id], [position.copy()]
+        while walker_id.size:
+            position += offset[source.draw(walker_id.size)]
+            done = on_boundary[position]
+            if done.any():
+                exit_position[walker_id[done]] = position[done]
+                keep = ~done
+                walker_id, position = walker_id[keep], position[keep]
+            first_visit = ~visited[walker_id, position]
+            visited[walker_id[first_visit], position[first_visit]] = True
+            visit_id.append(walker_id[first_visit])
+            visit_position.append(position[first_visit])
+
+        exit_value = grid.ravel()[exit_position]
+        visit_position = np.concatenate(visit_position)
+        sums += np.bincount(visit_position, weights=exit_value[np.concatenate(visit_id)], minlength=n * m)
+        counts += np.bincount(visit_position, minlength=n * m)
+
+    potential = np.array(grid, dtype=float).ravel()
+    with np.errstate(invalid="ignore"):
+        potential[interior] = sums[interior] / counts[interior]
+    return potential.reshape(grid.shape), counts.reshape(grid.shape)
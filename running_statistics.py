@@ -0,0 +1,82 @@
+import numpy as np
+from random_walks import sample_boundary_values, step_source
+
+class RunningStatistics:
+    """
+    Running count, mean and sum of squared deviations (Welford). Batches
+    are merged with the pairwise form of the update, which is exact and
+    numerically stable, so a sample can be extended without keeping it.
+    variance matches np.var (ddof=0); standard_error uses ddof=1.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        batch_mean = np.mean(values)
+        batch_m2 = np.sum((values - batch_mean) ** 2)
+        total = self.count + values.size
+        delta = batch_mean - self.mean
+        self.mean += delta * values.size / total
+        self.m2 += batch_m2 + delta ** 2 * self.count * values.size / total
+        self.count = total
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else np.nan
+
+    @property
+    def standard_error(self):
+        return np.sqrt(self.m2 / (self.count - 1) / self.count) if self.count > 1 else np.inf
+
+# Function to extend one sample of walks and report the estimate at several walker counts
+def streaming_estimate(grid, start_x, start_y, walkers_list=(), target_standard_error=None, max_walks=10 ** 7,
+                       batch_size=1000, rng=None, method="lattice"):
+    """
+    Draw walks from (start_x, start_y) in batches, feeding one
+    RunningStatistics, and record mean, variance and standard error each
+    time the sample reaches a count in walkers_list. The estimate at 10000
+    walkers therefore reuses the walks behind the earlier checkpoints
+    instead of drawing 16600 fresh ones.
+    With target_standard_error set, sampling also stops (and records a
+    final checkpoint) as soon as the standard error drops to the target,
+    or when max_walks is reached; "target_reached" then tells which.
+    Checkpoints beyond max_walks are dropped in that case.
+    Returns {"walkers": [...], "potentials": [...], "variances": [...],
+    "standard_errors": [...]}, plus "target_reached" when a target is set.
+    """
+    source = step_source(rng)
+    stats = RunningStatistics()
+    results = {"walkers": [], "potentials": [], "variances": [], "standard_errors": []}
+    checkpoints = sorted(walkers_list)
+    if target_standard_error is not None:
+        checkpoints = [count for count in checkpoints if count <= max_walks]
+
+    def record():
+        results["walkers"].append(stats.count)
+        results["potentials"].append(stats.mean)
+        results["variances"].append(stats.variance)
+        results["standard_errors"].append(stats.standard_error)
+
+    while checkpoints or (target_standard_error is not None and stats.count < max_walks):
+        stop = checkpoints[0] if checkpoints else max_walks
+        if target_standard_error is not None:
+            stop = min(stop, stats.count + batch_size, max_walks)
+        stats.update(sample_boundary_values(grid, start_x, start_y, stop - stats.count, source, method))
+        if checkpoints and stats.count == checkpoints[0]:
+            checkpoints.pop(0)
+            record()
+        if target_standard_error is not None and stats.standard_error <= target_standard_error:
+            results["target_reached"] = True
+            break
+    if target_standard_error is not None:
+        # Budget exhausted or target met: the last sample is always reported
+        results.setdefault("target_reached", False)
+        if not results["walkers"] or results["walkers"][-1] != stats.count:
+            record()
+    return results
@@ -0,0 +1,50 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+from direct_solver import solve_laplace_dst
+
+SIDES = ("left", "top", "right", "bottom")
+
+# Function to solve Laplace's equation once for each side held at 1 and the others at 0
+@lru_cache(maxsize=None)
+def boundary_basis(n, cache_dir=None):
+    """
+    Returns a read-only (4, n+2, n+2) array with the solutions for unit
+    left, top, right and bottom sides. The sides are written in the same
+    order as initialize_grid_with_custom_boundary, so the corners belong
+    to the same side as there. The result is kept in memory per n and,
+    with cache_dir set, also stored as a .npy file for later runs.
+    """
+    path = None if cache_dir is None else os.path.join(cache_dir, f"basis_{n}.npy")
+    if path is not None and os.path.exists(path):
+        basis = np.load(path)
+    else:
+        basis = np.zeros((4, n + 2, n + 2))
+        for side, v in enumerate(basis):
+            unit = np.zeros(4)
+            unit[side] = 1
+            v[:, 0] = unit[0]   # Left boundary
+            v[0, :] = unit[1]   # Top boundary
+            v[:, -1] = unit[2]  # Right boundary
+            v[-1, :] = unit[3]  # Bottom boundary
+            solve_laplace_dst(v, n)
+        if path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as file:
+                np.save(file, basis)
+            os.replace(temporary, path)
+    basis.setflags(write=False)
+    return basis
+
+# Function to solve for constant side values as a weighted sum of the four basis fields
+def solve_superposition(n, left=5, top=10, right=5, bottom=10, cache_dir=None):
+    """
+    Laplace's equation is linear, so the solution for any side values is
+    left * basis[0] + top * basis[1] + right * basis[2] + bottom * basis[3].
+    The side values may also be arrays (broadcast together), giving one
+    solution per entry with shape (..., n+2, n+2).
+    """
+    weights = np.stack(np.broadcast_arrays(left, top, right, bottom), axis=-1).astype(float)
+    return np.tensordot(weights, boundary_basis(n, cache_dir), axes=1)
@@ -0,0 +1,240 @@
+import os
+import time
+
+import numpy as np
+from laplace_solver import relax_gauss_seidel, relax_checkerboard, run_jacobi, run_jacobi_chebyshev, run_relaxation_batch
+from multigrid import prolong, run_relaxation_multigrid
+from conjugate_gradient import run_relaxation_cg
+from direct_solver import solve_laplace_dst
+from parallel_walks import run_tasks
+
+# Function to run Jacobi sweeps until the largest change of a sweep drops below tolerance
+def solve_jacobi(v, n, tolerance, nsteps=10000, error="max"):
+    return run_jacobi(v, n, tolerance, nsteps, error=error)
+
+# Function to run Gauss-Seidel sweeps until the residual before a sweep drops below tolerance
+def solve_gauss_seidel(v, n, tolerance, nsteps=10000, error="max"):
+    """
+    The residual comes out of the sweep that follows it, so the returned
+    grid has had one sweep more than the iterations counted.
+    """
+    iterations = 0
+    for _ in range(nsteps):
+        if error == "max":
+            size = relax_gauss_seidel(v, n)
+        else:
+            interior = v[1:-1, 1:-1].copy()
+            relax_gauss_seidel(v, n)
+            size = np.sqrt(np.mean((v[1:-1, 1:-1] - interior) ** 2))
+        if size < tolerance:
+            break
+        iterations += 1
+    return iterations, v
+
+# Function to run checkerboard sweeps (omega="auto" for SOR) until the residual before a sweep drops below tolerance
+def solve_checkerboard(v, n, tolerance, nsteps=10000, omega=1.0):
+    """
+    Same test as solve_gauss_seidel, so the returned grid likewise has had
+    one sweep more than the iterations counted.
+    """
+    iterations = 0
+    for _ in range(nsteps):
+        if relax_checkerboard(v, n, omega) < tolerance:
+            break
+        iterations += 1
+    return iterations, v
+
+# Function to run multigrid V-cycles until the residual drops below tolerance
+def solve_multigrid(v, n, tolerance, nsteps=10000, smoother="checkerboard", fmg=False):
+    return run_relaxation_multigrid(v, n, tolerance=tolerance, nsteps=nsteps, smoother=smoother, fmg=fmg)
+
+# Function to run preconditioned conjugate gradients until the residual drops below tolerance
+def solve_cg(v, n, tolerance, nsteps=10000, preconditioner="ssor"):
+    return run_relaxation_cg(v, n, tolerance=tolerance, nsteps=nsteps, preconditioner=preconditioner)[:2]
+
+# Function to fill the grid with the exact solution of the 5-point equations
+def solve_exact(v, n, tolerance):
+    return 0, solve_laplace_dst(v, n)
+
+# Methods a sweep job can name: the solver, called as solver(v, n, tolerance, **options) and returning
+# (iterations, final grid), and its options, which are part of the cache key
+METHODS = {
+    "jacobi": (solve_jacobi, {"nsteps": 10000, "error": "max"}),
+    "jacobi_rms": (solve_jacobi, {"nsteps": 10000, "error": "rms"}),
+    "chebyshev": (run_jacobi_chebyshev, {"nsteps": 10000}),
+    "gauss_seidel": (solve_gauss_seidel, {"nsteps": 10000, "error": "max"}),
+    "gauss_seidel_rms": (solve_gauss_seidel, {"nsteps": 10000, "error": "rms"}),
+    "checkerboard": (solve_checkerboard, {"nsteps": 10000, "omega": 1.0}),
+    "sor": (solve_checkerboard, {"nsteps": 10000, "omega": "auto"}),
+    "multigrid": (solve_multigrid, {"nsteps": 10000, "smoother": "checkerboard", "fmg": False}),
+    "cg": (solve_cg, {"nsteps": 10000, "preconditioner": "ssor"}),
+    "exact": (solve_exact, {}),
+}
+
+# Methods whose jobs of one grid size can be stacked and solved together by run_relaxation_batch, which gives
+# the same counts and grids as their single-grid solver
+BATCH_METHODS = {"jacobi": "jacobi", "gauss_seidel": "gauss_seidel", "checkerboard": "checkerboard",
+                 "sor": "checkerboard"}
+
+# Part of every cache key; bump it when a solver changes the grids or counts it returns
+SWEEP_VERSION = 2
+
+# Function to build the starting grid of a job
+def initial_grid(n, boundaries, initial=7.5):
+    left, top, right, bottom = boundaries
+    v = np.full((n + 2, n + 2), float(initial))
+    v[:, 0] = left   # Left boundary
+    v[0, :] = top    # Top boundary
+    v[:, -1] = right # Right boundary
+    v[-1, :] = bottom # Bottom boundary
+    return v
+
+# Function to group jobs into chains of increasing grid size with the same method, boundaries and tolerance
+def warm_start_chains(jobs):
+    chains = {}
+    for method, n, boundaries, tolerance in jobs:
+        chains.setdefault((method, boundaries, tolerance), set()).add(n)
+    return {chain: sorted(sizes) for chain, sizes in chains.items()}
+
+# Function to pair every job with the smaller grid sizes its chain solves before it
+def warm_start_sizes(jobs):
+    """
+    Returns {job: tuple of the smaller sizes of its chain, in order}, None
+    for the smallest size of each chain, which has nothing to start from
+    and is solved cold. The start grid of a job depends on all of them,
+    not only on the last one.
+    """
+    previous = {}
+    for (method, boundaries, tolerance), sizes in warm_start_chains(jobs).items():
+        for index, n in enumerate(sizes):
+            previous[(method, n, boundaries, tolerance)] = tuple(sizes[:index]) or None
+    return previous
+
+# Function to find where the result of a job is stored
+def sweep_path(job, store="sweep_cache", initial=7.5, previous=None):
+    """
+    previous is the chain of grid sizes a warm-started job was built up
+    from (see warm_start_sizes); warm and cold results, and results of
+    different chains, are stored (and reported) separately. The name
+    also holds the method's options and SWEEP_VERSION, so changing either
+    never loads a stale result.
+    """
+    method, n, boundaries, tolerance = job
+    left, top, right, bottom = boundaries
+    options = "".join(f"_{key}={value}" for key, value in sorted(METHODS[method][1].items()))
+    warm = "" if previous is None else "_warm" + "-".join(str(size) for size in previous)
+    return os.path.join(store, f"v{SWEEP_VERSION}_{method}{options}_{n}_{left}-{top}-{right}-{bottom}_{tolerance}"
+                               f"_{float(initial)}{warm}.npz")
+
+# Function to start a grid from the converged solution on a coarser grid (nested iteration)
+def warm_start_grid(previous_grid, n, boundaries, initial=7.5):
+    v = initial_grid(n, boundaries, initial)
+    v[1:-1, 1:-1] = prolong(previous_grid, n)
+    return v
+
+# Function to write one solved job to the store
+def _store(path, iterations, v, seconds):
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        np.savez(file, iterations=iterations, grid=v, seconds=seconds)
+    os.replace(temporary, path)
+
+# Function to solve one job from the grid v and write it to the store
+def _solve_and_store(method, v, n, tolerance, path):
+    start = time.perf_counter()
+    solver, options = METHODS[method]
+    iterations, v = solver(v, n, tolerance, **options)
+    _store(path, iterations, v, time.perf_counter() - start)
+    return v
+
+# Function run by a worker: solve the jobs of one method, size and tolerance from the flat initial guess
+def _run_jobs(method, n, boundaries_list, tolerance, initial, store):
+    """
+    Several boundaries of a BATCH_METHODS method are solved as one stack
+    with run_relaxation_batch; every job then records the batch time
+    divided by the number of jobs.
+    """
+    paths = [sweep_path((method, n, boundaries, tolerance), store, initial) for boundaries in boundaries_list]
+    if method in BATCH_METHODS and len(boundaries_list) > 1:
+        start = time.perf_counter()
+        options = METHODS[method][1]
+        v = np.stack([initial_grid(n, boundaries, initial) for boundaries in boundaries_list])
+        iterations, v = run_relaxation_batch(v, n, BATCH_METHODS[method], tolerance, options["nsteps"],
+                                             options.get("omega", 1.0))
+        seconds = (time.perf_counter() - start) / len(boundaries_list)
+        for path, count, grid in zip(paths, iterations, v):
+            _store(path, count, grid, seconds)
+    else:
+        for path, boundaries in zip(paths, boundaries_list):
+            _solve_and_store(method, initial_grid(n, boundaries, initial), n, tolerance, path)
+    return paths
+
+# Function run by a worker: solve the sizes of one method in increasing order, each warm-started from the last
+def _run_chain(method, sizes, boundaries, tolerance, initial, store):
+    previous_grid = None
+    for index, n in enumerate(sizes):
+        path = sweep_path((method, n, boundaries, tolerance), store, initial, tuple(sizes[:index]) or None)
+        if os.path.exists(path):
+            with np.load(path) as data:
+                previous_grid = data["grid"]
+        elif previous_grid is None:
+            previous_grid = _solve_and_store(method, initial_grid(n, boundaries, initial), n, tolerance, path)
+        else:
+            previous_grid = _solve_and_store(method, warm_start_grid(previous_grid, n, boundaries, initial), n,
+                                             tolerance, path)
+    return sizes
+
+# Function to load finished jobs from the store
+def load_sweep(jobs, store="sweep_cache", initial=7.5, warm_start=False):
+    """
+    Returns {job: {"iterations": ..., "grid": ..., "seconds": ...}} and
+    raises FileNotFoundError for a job that has not been run.
+    """
+    previous = warm_start_sizes(jobs) if warm_start else {}
+    results = {}
+    for job in jobs:
+        with np.load(sweep_path(job, store, initial, previous.get(job))) as data:
+            results[job] = {"iterations": int(data["iterations"]), "grid": data["grid"],
+                            "seconds": float(data["seconds"])}
+    return results
+
+# Function to run a list of (method, n, boundaries, tolerance) jobs, reusing the ones already stored
+def run_sweep(jobs, store="sweep_cache", workers=None, initial=7.5, warm_start=False):
+    """
+    boundaries is (left, top, right, bottom) and the interior starts at
+    initial. Jobs missing from store are solved on a process pool of
+    `workers` processes (in this process for None or 1), largest grids
+    first. Jobs of a BATCH_METHODS method that differ only in boundaries
+    are solved together as one run_relaxation_batch stack. Every job
+    writes its own file as soon as it (or its stack) finishes, with a
+    temporary name and a rename, so an interrupted sweep keeps all
+    completed jobs and a repeated one only loads them.
+    With warm_start=True each job instead starts from the converged grid
+    of the next smaller size in the sweep (same method, boundaries and
+    tolerance), interpolated with multigrid.prolong. Such a chain has to
+    run in order, so every chain is one task and only different chains
+    run in parallel.
+    Returns load_sweep(jobs, store, initial, warm_start).
+    """
+    for method, _, _, _ in jobs:
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {tuple(METHODS)}, got {method!r}")
+    os.makedirs(store, exist_ok=True)
+    if warm_start:
+        previous = warm_start_sizes(jobs)
+        tasks = []
+        for (method, boundaries, tolerance), sizes in warm_start_chains(jobs).items():
+            chain_jobs = [(method, n, boundaries, tolerance) for n in sizes]
+            if not all(os.path.exists(sweep_path(job, store, initial, previous[job])) for job in chain_jobs):
+                tasks.append((method, sizes, boundaries, tolerance, initial, store))
+        run_tasks(_run_chain, tasks, workers)
+    else:
+        # Missing jobs of a batchable method and one grid size form one task, the others one task each
+        groups = {}
+        for job in sorted({job for job in jobs if not os.path.exists(sweep_path(job, store, initial))}):
+            method, n, boundaries, tolerance = job
+            key = (method, n, tolerance) if method in BATCH_METHODS else job
+            groups.setdefault(key, (method, n, [], tolerance))[2].append(boundaries)
+        tasks = sorted(groups.values(), key=lambda group: -group[1])
+        run_tasks(_run_jobs, [(*group, initial, store) for group in tasks], workers)
+    return load_sweep(jobs, store, initial, warm_start)
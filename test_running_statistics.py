@@ -0,0 +1,25 @@
+import numpy as np
+from running_statistics import streaming_estimate
+
+
+# Function to build the 5 V / 10 V box used by the exercises
+def box_grid(n=10):
+    grid = np.full((n + 2, n + 2), 7.5)
+    grid[:, 0] = 5
+    grid[0, :] = 10
+    grid[:, -1] = 5
+    grid[-1, :] = 10
+    return grid
+
+
+def test_streaming_estimate_stops_at_max_walks_with_larger_checkpoints():
+    results = streaming_estimate(box_grid(), 5, 5, walkers_list=[100, 10000], target_standard_error=1e-6,
+                                 max_walks=5000, rng=1)
+    assert results["walkers"] == [100, 5000]
+    assert results["target_reached"] is False
+
+
+def test_streaming_estimate_records_when_budget_runs_out():
+    results = streaming_estimate(box_grid(), 5, 5, target_standard_error=1e-9, max_walks=5000, rng=1)
+    assert results["walkers"] == [5000]
+    assert results["target_reached"] is False